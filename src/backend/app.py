@@ -1,38 +1,103 @@
 from flask import Flask, request, jsonify, make_response
 from flask_cors import CORS
+from flask_compress import Compress
 import numpy as np
 from scipy import signal
 import logging
-import io
+import os
 import struct
-from flask import send_file
+import ast
 import traceback
-from functools import wraps
+from functools import wraps, lru_cache
 import base64
+import hashlib
 from scipy import ndimage
 import cv2
+import orjson
+
+# Debug logging and Flask's debugger/reloader are opt-in via WAVETABLE_DEBUG=1
+DEBUG = os.environ.get('WAVETABLE_DEBUG') == '1'
 
 # Configure logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.DEBUG if DEBUG else logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Requests are parallelized by the WSGI server's workers and threads (see
+# wsgi.py); keep OpenCV from spawning its own thread pool inside each one
+cv2.setNumThreads(1)
+
 app = Flask(__name__)
 
+# Compress large JSON frame payloads; small error bodies aren't worth it.
+# Payloads are generated per request, so favour fast levels over ratio
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 4096
+app.config['COMPRESS_BR_LEVEL'] = 1
+app.config['COMPRESS_LEVEL'] = 1
+Compress(app)
+
+def json_response(payload, status=200):
+    """Serialize a response with orjson, which encodes NumPy arrays natively."""
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+def wants_pcm():
+    """Check whether the client asked for raw PCM instead of JSON."""
+    best = request.accept_mimetypes.best_match(['application/json', 'application/octet-stream'])
+    return best == 'application/octet-stream'
+
+def pcm_response(frames):
+    """Return (num_frames, frame_size) frames as little-endian int16 PCM bytes."""
+    samples = np.clip(np.asarray(frames, dtype=np.float32), -1.0, 1.0) * 32767.0
+    np.rint(samples, out=samples)
+    response = app.response_class(samples.astype('<i2').tobytes(), mimetype='application/octet-stream')
+    response.headers['X-Num-Frames'] = str(samples.shape[0])
+    response.headers['X-Frame-Size'] = str(samples.shape[1])
+    return response
+
+# Compact frame encodings clients can opt into with ?encoding=<name>
+FRAME_ENCODINGS = {'f32b64': '<f4', 'f16b64': '<f2'}
+
+def encode_frames(frames, encoding=None):
+    """
+    Return the frames field of a response in the given encoding.
+    
+    By default frames are sent as nested JSON lists. With a FRAME_ENCODINGS
+    name they are sent as base64 of little-endian float32 or float16 samples
+    in row-major order, together with the encoding name and shape needed to
+    decode them.
+    """
+    if encoding not in FRAME_ENCODINGS:
+        return {'frames': frames}
+    
+    samples = np.ascontiguousarray(frames, dtype=FRAME_ENCODINGS[encoding])
+    return {
+        'frames_b64': base64.b64encode(samples.tobytes()).decode('ascii'),
+        'frames_encoding': encoding,
+        'frames_shape': list(samples.shape)
+    }
+
+def frames_payload(frames):
+    """Return the frames field of a response in the encoding the request asked for."""
+    return encode_frames(frames, request.args.get('encoding'))
+
 def handle_errors(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
         try:
             return f(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {f.__name__}: {str(e)}")
-            logger.error(traceback.format_exc())
-            return jsonify({
-                'error': str(e),
-                'details': traceback.format_exc()
-            }), 500
+            logger.exception(f"Error in {f.__name__}")
+            response = {'error': str(e)}
+            if app.debug:
+                response['details'] = traceback.format_exc()
+            return jsonify(response), 500
     return wrapper
 
 # Configure CORS
@@ -41,126 +106,153 @@ CORS(app,
          "origins": ["http://localhost:5173"],  # Vite's default dev server
          "methods": ["GET", "POST", "OPTIONS"],
          "allow_headers": ["Content-Type", "Authorization"],
-         "expose_headers": ["Content-Type", "Authorization"],
+         "expose_headers": ["Content-Type", "Authorization", "X-Num-Frames", "X-Frame-Size"],
          "supports_credentials": True,
          "send_wildcard": False
      }})
 
-@app.after_request
-def after_request(response):
-    origin = request.headers.get('Origin')
-    if origin and origin in ["http://localhost:5173"]:
-        response.headers.add('Access-Control-Allow-Origin', origin)
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,POST,OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        response.headers.add('Vary', 'Origin')
-    return response
+@lru_cache(maxsize=8)
+def sample_times(num_samples):
+    """Return the cached, read-only phase grid t in [0, 1) for a frame size."""
+    t = np.linspace(0, 1, num_samples, endpoint=False)
+    t.flags.writeable = False
+    return t
+
+def peak_amplitude(x, axis=None, keepdims=False):
+    """Return max(|x|) of a float array from a max and a min reduction, without an |x| temporary."""
+    return np.maximum(np.max(x, axis=axis, keepdims=keepdims), -np.min(x, axis=axis, keepdims=keepdims))
 
+BASIC_WAVEFORM_TYPES = frozenset(('sine', 'square', 'sawtooth', 'triangle'))
+
+# Upper bound on frames per basic waveform response (the editor uses 256);
+# responses are cached, so an unbounded count could pin huge bodies in memory
+MAX_BASIC_FRAMES = 256
+
+@lru_cache(maxsize=32)
 def generate_basic_waveform(waveform_type, num_samples=2048):
-    """Generate a basic waveform."""
-    t = np.linspace(0, 1, num_samples, endpoint=False)
+    """Generate a basic waveform.
+
+    Results are cached per (type, size) and returned as read-only float32
+    arrays; copy before mutating.
+    """
+    t = sample_times(num_samples)
     
     if waveform_type == 'sine':
-        return np.sin(2 * np.pi * t)
+        waveform = np.sin(2 * np.pi * t)
     elif waveform_type == 'square':
-        return np.sign(np.sin(2 * np.pi * t))
+        waveform = np.sign(np.sin(2 * np.pi * t))
     elif waveform_type == 'sawtooth':
-        return 2 * (t - np.floor(0.5 + t))
+        waveform = 2 * (t - np.floor(0.5 + t))
     elif waveform_type == 'triangle':
-        return 2 * np.abs(2 * (t - np.floor(0.5 + t))) - 1
+        waveform = 2 * np.abs(2 * (t - np.floor(0.5 + t))) - 1
     else:
         raise ValueError(f"Unknown waveform type: {waveform_type}")
+    
+    waveform = waveform.astype(np.float32)
+    waveform.flags.writeable = False
+    return waveform
+
+# Functions available to user equations; trig functions take phase in cycles
+EQUATION_FUNCTIONS = {
+    'sin': lambda x: np.sin(2 * np.pi * x),
+    'cos': lambda x: np.cos(2 * np.pi * x),
+    'tan': lambda x: np.tan(2 * np.pi * x),
+    'abs': np.abs,
+    'sign': np.sign,
+    'pi': np.pi,
+    'exp': np.exp,
+    'log': np.log,
+    'sqrt': np.sqrt,
+    'tanh': lambda x: np.tanh(2 * np.pi * x),
+}
+EQUATION_VARIABLES = ('t', 'frame')
+
+# Syntax allowed in equations: arithmetic, elementwise comparisons and
+# bitwise logic on numbers, names and function calls. Comparisons yield
+# boolean arrays, e.g. (t<0.5)*2-1 for a pulse or ((t>0.2)&(t<0.5)) for a window
+EQUATION_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+    ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+    ast.BitAnd, ast.BitOr, ast.BitXor, ast.Invert
+)
+
+@lru_cache(maxsize=128)
+def compile_equation(equation: str):
+    """Validate an equation's syntax tree and compile it once per equation string."""
+    # Replace ^ with ** for Python power operation
+    tree = ast.parse(equation.replace('^', '**'), mode='eval')
+    
+    # Check for unsafe operations before anything reaches eval
+    for node in ast.walk(tree):
+        if not isinstance(node, EQUATION_NODES):
+            raise ValueError(f"Unsupported syntax in equation: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in EQUATION_FUNCTIONS and node.id not in EQUATION_VARIABLES:
+            raise ValueError(f"Function '{node.id}' is not supported. Supported functions are: sin, cos, tan, abs, sign, exp, log, sqrt, tanh")
+        if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords):
+            raise ValueError("Only plain function calls are supported in equations")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("Only numeric constants are supported in equations")
+    
+    return compile(tree, '<string>', 'eval')
 
 def evaluate_equation(equation: str, t: np.ndarray, frame: float = 0):
     """Safely evaluate a waveform equation."""
-    safe_dict = {
-        'sin': lambda x: np.sin(2 * np.pi * x),
-        'cos': lambda x: np.cos(2 * np.pi * x),
-        'tan': lambda x: np.tan(2 * np.pi * x),
-        'abs': np.abs,
-        'sign': np.sign,
-        'pi': np.pi,
-        'exp': np.exp,
-        'log': np.log,
-        'sqrt': np.sqrt,
-        'tanh': lambda x: np.tanh(2 * np.pi * x),
-        't': t,
-        'frame': frame
-    }
-    
     try:
-        # Replace ^ with ** for Python power operation
-        equation = equation.replace('^', '**')
-        code = compile(equation, '<string>', 'eval')
-        
-        # Check for unsafe operations
-        for name in code.co_names:
-            if name not in safe_dict:
-                raise ValueError(f"Function '{name}' is not supported. Supported functions are: sin, cos, tan, abs, sign, exp, log, sqrt, tanh")
-        
-        result = eval(code, {"__builtins__": {}}, safe_dict)
+        code = compile_equation(equation)
+        namespace = dict(EQUATION_FUNCTIONS, t=t, frame=frame)
+        result = eval(code, {"__builtins__": {}}, namespace)
         return result
     except Exception as e:
         raise ValueError(f"Error evaluating equation: {str(e)}")
 
+# RIFF/WAVE header for 16-bit PCM: RIFF chunk, fmt chunk and data chunk header
+WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
 def generate_wav_file(frames, sample_rate=44100, gain=1.0):
-    """Generate a WAV file from wavetable frames."""
-    num_frames = len(frames)
-    frame_size = len(frames[0])
-    
-    # Create WAV file in memory
-    buffer = io.BytesIO()
-    
-    # WAV header
-    buffer.write(b'RIFF')
-    buffer.write(b'\x00\x00\x00\x00')  # File size (filled later)
-    buffer.write(b'WAVE')
-    
-    # Format chunk
-    buffer.write(b'fmt ')
-    buffer.write(struct.pack('<I', 16))  # Chunk size
-    buffer.write(struct.pack('<H', 1))   # Audio format (PCM)
-    buffer.write(struct.pack('<H', 1))   # Num channels (mono)
-    buffer.write(struct.pack('<I', sample_rate))  # Sample rate
-    buffer.write(struct.pack('<I', sample_rate * 2))  # Byte rate
-    buffer.write(struct.pack('<H', 2))   # Block align
-    buffer.write(struct.pack('<H', 16))  # Bits per sample
-    
-    # Data chunk
-    buffer.write(b'data')
-    buffer.write(struct.pack('<I', num_frames * frame_size * 2))  # Data size
-    
-    # Write frame data
-    for frame in frames:
-        # Apply gain and convert float32 [-1, 1] to int16
-        # Clip to prevent overflow
-        samples = np.clip(np.array(frame) * gain, -1, 1) * 32767
-        samples = samples.astype(np.int16)
-        buffer.write(samples.tobytes())
-    
-    # Set file size in header
-    file_size = buffer.tell()
-    buffer.seek(4)
-    buffer.write(struct.pack('<I', file_size - 8))
-    
-    buffer.seek(0)
-    return buffer
+    """Generate the bytes of a WAV file from wavetable frames."""
+    # Apply gain and int16 scaling in one multiply, then clip to prevent
+    # overflow, for all frames at once; round to nearest so the int16 cast
+    # doesn't truncate toward zero
+    samples = np.array(frames, dtype=np.float32).ravel()
+    np.multiply(samples, gain * 32767.0, out=samples)
+    np.clip(samples, -32767.0, 32767.0, out=samples)
+    np.rint(samples, out=samples)
+    data_size = samples.size * 2
+    
+    # Build the whole file in one int16 buffer: the 44-byte header is packed
+    # into its first 22 slots and the samples are converted straight into the rest
+    header_slots = WAV_HEADER.size // 2
+    wav = np.empty(header_slots + samples.size, dtype='<i2')
+    WAV_HEADER.pack_into(
+        wav, 0,
+        b'RIFF', WAV_HEADER.size - 8 + data_size, b'WAVE',
+        b'fmt ', 16,          # Chunk size
+        1,                    # Audio format (PCM)
+        1,                    # Num channels (mono)
+        sample_rate,          # Sample rate
+        sample_rate * 2,      # Byte rate
+        2,                    # Block align
+        16,                   # Bits per sample
+        b'data', data_size    # Data size
+    )
+    wav[header_slots:] = samples
+    
+    return wav.tobytes()
 
-def enhance_harmonics(waveform, strength):
-    """Enhance harmonics with formant-like filtering."""
-    # Convert input to numpy array if it's a list
-    waveform = np.array(waveform)
+@lru_cache(maxsize=64)
+def formant_filter_response(num_bins, strength):
+    """
+    Build the formant-like magnitude filter for a spectrum of num_bins bins.
     
-    # Store original phase information
-    spectrum = np.fft.rfft(waveform)
-    original_phases = np.angle(spectrum)
-    original_magnitudes = np.abs(spectrum)
-    freqs = np.arange(len(spectrum))
+    The response only depends on the spectrum length and strength, so it is
+    cached and shared by every frame; the returned array is read-only.
+    """
+    freqs = np.arange(num_bins)
     
     # Create formant-like filter with gentler effect
-    center_freq = len(spectrum) // 4
-    bandwidth = len(spectrum) // 6  # Slightly narrower bandwidth
+    center_freq = num_bins // 4
+    bandwidth = num_bins // 6  # Slightly narrower bandwidth
     
     # Create resonant peaks with more controlled amplitudes
     formant = np.exp(-0.5 * ((freqs - center_freq) / bandwidth) ** 2)
@@ -168,7 +260,6 @@ def enhance_harmonics(waveform, strength):
     formant3 = 0.15 * np.exp(-0.5 * ((freqs - center_freq * 3) / (bandwidth * 2)) ** 2)
     
     # Create a more subtle filter response
-    filter_response = np.ones_like(freqs, dtype=float)
     if strength > 0:
         # More controlled additive enhancement
         filter_response = 1.0 + (strength * 0.25 * (formant + formant2 + formant3))
@@ -177,86 +268,112 @@ def enhance_harmonics(waveform, strength):
         filter_response = 1.0 + (strength * 0.15 * (formant + formant2 + formant3))
     
     # Ensure filter response stays very close to 1.0 for low frequencies
-    low_freq_mask = freqs < (len(spectrum) // 16)
+    low_freq_mask = freqs < (num_bins // 16)
     filter_response[low_freq_mask] = 1.0 + (filter_response[low_freq_mask] - 1.0) * 0.1
     
     # Clip the filter response to prevent extreme changes
     filter_response = np.clip(filter_response, 0.25, 4.0)
+    filter_response.flags.writeable = False
+    return filter_response
+
+def enhance_harmonics(waveform, strength):
+    """
+    Enhance harmonics with formant-like filtering.
     
-    # Apply filter to magnitudes while preserving phases
-    enhanced_magnitudes = original_magnitudes * filter_response
+    Accepts a single waveform or a (num_frames, frame_size) array; frames
+    are transformed together along the last axis and scaled individually.
+    """
+    # Convert input to numpy array if it's a list
+    waveform = np.asarray(waveform, dtype=np.float64)
     
-    # Ensure we preserve the fundamental frequency
-    enhanced_magnitudes[1:4] = original_magnitudes[1:4]
+    spectrum = np.fft.rfft(waveform, axis=-1)
+    filter_response = formant_filter_response(spectrum.shape[-1], strength)
     
-    # Reconstruct spectrum using original phases
-    enhanced_spectrum = enhanced_magnitudes * np.exp(1j * original_phases)
+    # The filter is real and positive, so scaling the complex spectrum
+    # scales the magnitudes while preserving the original phases
+    enhanced_spectrum = spectrum * filter_response
     
-    # Preserve DC component exactly
-    enhanced_spectrum[0] = spectrum[0]
+    # Preserve the DC component and the fundamental frequency exactly
+    enhanced_spectrum[..., :4] = spectrum[..., :4]
     
     # Convert back to time domain
-    enhanced_waveform = np.fft.irfft(enhanced_spectrum)
+    enhanced_waveform = np.fft.irfft(enhanced_spectrum, n=waveform.shape[-1], axis=-1)
     
-    # Scale the waveform while preserving shape
-    max_abs = np.max(np.abs(enhanced_waveform))
-    if max_abs > 0:
-        # First normalize
-        enhanced_waveform = enhanced_waveform / max_abs
-        
-        # Then scale to match original amplitude
-        original_max = np.max(np.abs(waveform))
-        if original_max > 0:
-            enhanced_waveform *= original_max
-            
-        # Blend with original to maintain character
-        blend_factor = abs(strength) * 0.5  # More conservative blending
-        enhanced_waveform = (1 - blend_factor) * waveform + blend_factor * enhanced_waveform
+    # Scale each frame while preserving shape: first normalize, then scale
+    # to match the original amplitude
+    max_abs = peak_amplitude(enhanced_waveform, axis=-1, keepdims=True)
+    original_max = peak_amplitude(waveform, axis=-1, keepdims=True)
+    np.divide(enhanced_waveform, max_abs, out=enhanced_waveform, where=max_abs > 0)
+    np.multiply(enhanced_waveform, original_max, out=enhanced_waveform, where=(max_abs > 0) & (original_max > 0))
+    
+    # Blend with original to maintain character
+    blend_factor = abs(strength) * 0.5  # More conservative blending
+    blended = (1 - blend_factor) * waveform + blend_factor * enhanced_waveform
+    return np.where(max_abs > 0, blended, enhanced_waveform)
+
+def lorenz_trajectory(num_samples, sigma, rho, beta, dt):
+    """
+    Integrate the Lorenz system with forward Euler steps.
+    
+    The trajectory only depends on the system parameters, never on the
+    waveform being folded, so it is computed separately with plain float
+    arithmetic and applied to the samples with vectorized NumPy ops.
+    
+    Returns:
+        The y component after each step (numpy array of length num_samples)
+    """
+    x, y, z = 0.1, 0.1, 0.1
+    ys = [0.0] * num_samples
+    for i in range(num_samples):
+        dx = sigma * (y - x) * dt
+        dy = (x * (rho - z) - y) * dt
+        dz = (x * y - beta * z) * dt
+        x, y, z = x + dx, y + dy, z + dz
+        ys[i] = y
+    return np.array(ys, dtype=np.float64)
+
+@lru_cache(maxsize=32)
+def lorenz_fold_thresholds(num_samples, sigma, rho, beta, dt):
+    """
+    Return the cached, read-only per-sample fold thresholds tanh(y).
     
-    return enhanced_waveform.tolist()
+    Every frame of a wavetable is folded with the same parameters and
+    length, so the trajectory is integrated once and shared by all frames.
+    """
+    thresholds = np.tanh(lorenz_trajectory(num_samples, sigma, rho, beta, dt))
+    thresholds.flags.writeable = False
+    return thresholds
 
 def lorenz_wavefold(waveform, sigma=10, rho=28, beta=2.667, dt=0.01):
     """
     Apply Lorenz attractor-based chaotic wavefolding to a waveform.
     
     Args:
-        waveform: Input waveform (numpy array)
+        waveform: Input waveform (numpy array), or a (num_frames, frame_size)
+            array to fold every frame at once
         sigma, rho, beta: Parameters for Lorenz system
         dt: Time step for the Lorenz system
     Returns:
-        Folded waveform with chaotic modulation
+        Folded waveform with chaotic modulation, each frame normalized
     """
     try:
-        logger.debug(f"Lorenz input shape: {np.array(waveform).shape}, type: {type(waveform)}")
-        logger.debug(f"Parameters: sigma={sigma}, rho={rho}, beta={beta}, dt={dt}")
-        
         # Convert input to numpy array if it's a list
-        waveform = np.array(waveform, dtype=np.float64)
+        waveform = np.asarray(waveform, dtype=np.float64)
+        logger.debug("Lorenz input shape: %s", waveform.shape)
+        logger.debug("Parameters: sigma=%s, rho=%s, beta=%s, dt=%s", sigma, rho, beta, dt)
         if waveform.size == 0:
             raise ValueError("Empty waveform array")
             
-        # Initialize Lorenz system
-        x, y, z = 0.1, 0.1, 0.1
-        folded_wave = np.zeros_like(waveform, dtype=np.float64)
+        # Use chaotic y-values to modulate the fold threshold per sample;
+        # the thresholds broadcast across frames along the last axis
+        fold_threshold = lorenz_fold_thresholds(waveform.shape[-1], sigma, rho, beta, dt)
+        folded_wave = np.clip(waveform, -fold_threshold, fold_threshold)
         
-        # Apply folding with Lorenz modulation
-        for i, s in enumerate(waveform):
-            # Update Lorenz system
-            dx = sigma * (y - x) * dt
-            dy = (x * (rho - z) - y) * dt
-            dz = (x * y - beta * z) * dt
-            x, y, z = x + dx, y + dy, z + dz
+        # Normalize each frame of the output
+        max_val = peak_amplitude(folded_wave, axis=-1, keepdims=True)
+        np.divide(folded_wave, max_val, out=folded_wave, where=max_val > 0)
             
-            # Use chaotic y-value to modulate fold threshold
-            fold_threshold = np.tanh(y)
-            folded_wave[i] = np.clip(s, -fold_threshold, fold_threshold)
-        
-        # Normalize the output
-        max_val = np.max(np.abs(folded_wave))
-        if max_val > 0:
-            folded_wave = folded_wave / max_val
-            
-        logger.debug(f"Lorenz output shape: {folded_wave.shape}")
+        logger.debug("Lorenz output shape: %s", folded_wave.shape)
         return folded_wave
         
     except Exception as e:
@@ -270,24 +387,71 @@ def optimize_array(arr, precision=4):
     """Optimize array by reducing precision."""
     return np.round(arr, precision)
 
+# Upper bound on posted frame lengths (the editor uses 2048); per-length
+# tables such as the Lorenz thresholds and formant filter are cached
+MAX_FRAME_SIZE = 8192
+
 def validate_frames(frames):
-    """Validate frames data."""
+    """Validate frames data and return it as a (num_frames, frame_size) float64 array."""
     if not isinstance(frames, list):
         raise ValueError("Frames must be a list")
     if not frames:
         raise ValueError("No frames provided")
     if not all(isinstance(frame, list) for frame in frames):
         raise ValueError("Each frame must be a list")
-    if not all(all(isinstance(x, (int, float)) or (isinstance(x, str) and x.replace('.', '').isdigit()) for x in frame) for frame in frames):
+    if len({len(frame) for frame in frames}) != 1:
+        raise ValueError("All frames must have the same length")
+    if len(frames[0]) > MAX_FRAME_SIZE:
+        raise ValueError(f"Frames must have at most {MAX_FRAME_SIZE} samples")
+    
+    # Let NumPy do the numeric conversion in C; it rejects anything non-numeric
+    try:
+        arr = np.asarray(frames, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Frame values must be numbers")
+    if arr.ndim != 2 or not np.isfinite(arr).all():
         raise ValueError("Frame values must be numbers")
-    return True
+    return arr
+
+def request_frames(data):
+    """
+    Return the frames posted in a request body as a 2D float64 array.
+    
+    Frames are read from nested lists under 'frames', or, when
+    'frames_encoding' names one of FRAME_ENCODINGS, from the same
+    'frames_b64'/'frames_shape' fields that encoded responses use.
+    """
+    encoding = data.get('frames_encoding')
+    if encoding is None:
+        frames = data.get('frames')
+        if not frames:
+            raise ValueError("No frame data provided")
+        return validate_frames(frames)
+    
+    if not isinstance(encoding, str) or encoding not in FRAME_ENCODINGS:
+        raise ValueError(f"Unsupported frames encoding: {encoding}")
+    try:
+        shape = data['frames_shape']
+        if not (isinstance(shape, list) and len(shape) == 2
+                and all(isinstance(n, int) and not isinstance(n, bool) and n > 0 for n in shape)):
+            raise ValueError("frames_shape must be a list of two positive integers")
+        samples = np.frombuffer(base64.b64decode(data['frames_b64'], validate=True), dtype=FRAME_ENCODINGS[encoding])
+        frames = samples.reshape(shape)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid encoded frames: {str(e)}")
+    if frames.size == 0 or not np.isfinite(frames).all():
+        raise ValueError("Encoded frames must be a non-empty 2D array of finite numbers")
+    if frames.shape[1] > MAX_FRAME_SIZE:
+        raise ValueError(f"Frames must have at most {MAX_FRAME_SIZE} samples")
+    return frames.astype(np.float64)
+
+CHAOS_PARAMS = frozenset(('sigma', 'rho', 'beta', 'dt'))
 
 def validate_params(params):
     """Validate chaos parameters."""
-    required = {'sigma', 'rho', 'beta', 'dt'}
-    missing = required - set(params.keys())
+    missing = CHAOS_PARAMS - params.keys()
     if missing:
-        raise ValueError(f"Missing required parameters: {missing}")
+        raise ValueError(f"Missing required parameters: {', '.join(sorted(missing))}")
     
     try:
         validated = {
@@ -322,37 +486,66 @@ def generate_from_equation():
         num_frames = int(data.get('frames', 8))
         frame_size = 2048
         
-        frames = []
-        t = np.linspace(0, 1, frame_size, endpoint=False)
-        max_amplitude = 0
+        # Evaluate the whole wavetable at once: t varies along columns and
+        # frame along rows, so broadcasting yields a (num_frames, frame_size) grid
+        t = sample_times(frame_size)
+        frame_values = np.arange(num_frames) / (num_frames - 1) if num_frames > 1 else np.zeros(num_frames)
+        waveforms = evaluate_equation(equation, t[np.newaxis, :], frame_values[:, np.newaxis])
+        # Copy into a writable, C-ordered array: broadcast_to returns a read-only
+        # view, and a (1, N) result broadcast to (F, N) would keep a Fortran
+        # order that orjson rejects
+        frames = np.array(np.broadcast_to(waveforms, (num_frames, frame_size)), dtype=np.float32, order='C')
         
-        # First pass: generate all frames and find global max amplitude
-        for i in range(num_frames):
-            frame_value = i / (num_frames - 1) if num_frames > 1 else 0
-            waveform = evaluate_equation(equation, t, frame_value)
-            frames.append(waveform)
-            max_amplitude = max(max_amplitude, np.max(np.abs(waveform)))
-        
-        # Second pass: normalize all frames by the global max amplitude
+        # Normalize all frames by the global max amplitude
+        max_amplitude = peak_amplitude(frames) if frames.size else 0
         if max_amplitude > 0:
-            frames = [frame / max_amplitude for frame in frames]
+            frames /= max_amplitude
         
-        frames_list = [frame.tolist() for frame in frames]
+        if wants_pcm():
+            return pcm_response(frames)
         
         response = {
-            'waveform': frames_list[0],
-            'frames': frames_list,
+            'waveform': frames[0],
+            **frames_payload(frames),
             'frame_size': frame_size,
             'num_frames': num_frames,
-            'spectrum': np.abs(np.fft.rfft(frames_list[0])).tolist()
+            'spectrum': np.abs(np.fft.rfft(frames[0]))
         }
         
-        return jsonify(response)
+        return json_response(response)
+    except ValueError as e:
+        logger.error(f"Invalid equation request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Unexpected error in generate_from_equation: {str(e)}")
         logger.error(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
 
+@lru_cache(maxsize=8)
+def basic_waveform_body(waveform_type, num_frames, frame_size=2048, encoding=None):
+    """
+    Serialize a basic waveform response once; it only depends on its arguments.
+    
+    Returns the JSON body and an ETag derived from its contents.
+    """
+    waveform = generate_basic_waveform(waveform_type, frame_size)
+    
+    # For basic waveforms, use the same waveform for all frames; the
+    # frames share one array since they are only read during serialization
+    frames = [waveform] * num_frames
+    
+    response = {
+        'waveform': frames[0],
+        **encode_frames(frames, encoding),
+        'frame_size': frame_size,
+        'num_frames': num_frames,
+        'spectrum': np.abs(np.fft.rfft(frames[0])),
+        'type': waveform_type
+    }
+    
+    body = orjson.dumps(response, option=orjson.OPT_SERIALIZE_NUMPY)
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
 @app.route('/api/waveform/basic', methods=['GET'])
 @handle_errors
 def get_basic_waveform():
@@ -361,23 +554,33 @@ def get_basic_waveform():
         waveform_type = request.args.get('type', 'sine')
         num_frames = int(request.args.get('frames', 8))
         frame_size = 2048
+        if not 1 <= num_frames <= MAX_BASIC_FRAMES:
+            raise ValueError(f"frames must be between 1 and {MAX_BASIC_FRAMES}")
         
-        # Generate the basic waveform
-        waveform = generate_basic_waveform(waveform_type, frame_size)
+        if wants_pcm():
+            waveform = generate_basic_waveform(waveform_type, frame_size)
+            return pcm_response([waveform] * num_frames)
         
-        # For basic waveforms, use the same waveform for all frames
-        frames = [waveform.tolist() for _ in range(num_frames)]
+        # Unknown encodings fall back to JSON lists; don't cache them separately
+        encoding = request.args.get('encoding')
+        if encoding not in FRAME_ENCODINGS:
+            encoding = None
+        body, etag = basic_waveform_body(waveform_type, num_frames, frame_size, encoding)
         
-        response = {
-            'waveform': frames[0],
-            'frames': frames,
-            'frame_size': frame_size,
-            'num_frames': num_frames,
-            'spectrum': np.abs(np.fft.rfft(frames[0])).tolist(),
-            'type': waveform_type
-        }
-        
-        return jsonify(response)
+        # The body is deterministic, so let clients revalidate it with
+        # If-None-Match instead of downloading it again. The ETag is weak
+        # so it still matches after response compression
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+        response.vary.add('Accept')
+        # flask-cors doesn't send Vary: Origin for a single allowed origin;
+        # without it a shared cache could serve a copy missing the CORS headers
+        response.vary.add('Origin')
+        return response.make_conditional(request)
+    except ValueError as e:
+        logger.error(f"Invalid basic waveform request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Unexpected error in get_basic_waveform: {str(e)}")
         logger.error(traceback.format_exc())
@@ -389,20 +592,19 @@ def download_waveform():
     """Generate and download wavetable as WAV file."""
     try:
         data = request.get_json()
-        frames = data.get('frames', [])
+        frames = request_frames(data)
         gain = float(data.get('gain', 1.0))
         
-        if not frames:
-            raise ValueError("No frame data provided")
-        
-        wav_buffer = generate_wav_file(frames, gain=gain)
+        wav_bytes = generate_wav_file(frames, gain=gain)
         
-        return send_file(
-            wav_buffer,
+        return app.response_class(
+            wav_bytes,
             mimetype='audio/wav',
-            as_attachment=True,
-            download_name='wavetable.wav'
+            headers={'Content-Disposition': 'attachment; filename=wavetable.wav'}
         )
+    except ValueError as e:
+        logger.error(f"Invalid download request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Unexpected error in download_waveform: {str(e)}")
         logger.error(traceback.format_exc())
@@ -414,29 +616,29 @@ def enhance_waveform():
     """Enhance the harmonic content of a waveform."""
     try:
         data = request.get_json()
-        frames = data.get('frames', [])
+        frames = request_frames(data)
         strength = float(data.get('strength', 0.0))
         waveform_type = data.get('type')
-        
-        if not frames:
-            raise ValueError("No frame data provided")
             
-        # Process each frame
-        enhanced_frames = [enhance_harmonics(frame, strength) for frame in frames]
+        # Process all frames in one batched FFT round trip
+        enhanced_frames = enhance_harmonics(frames, strength)
         
         # For basic waveforms, ensure we maintain their characteristics
-        if waveform_type in ['sine', 'square', 'sawtooth', 'triangle']:
+        if waveform_type in BASIC_WAVEFORM_TYPES:
             # Calculate the average frame
             avg_frame = np.mean(enhanced_frames, axis=0)
             # Use this as the base for all frames to prevent morphing
-            enhanced_frames = [avg_frame.tolist() for _ in range(len(frames))]
+            enhanced_frames = np.repeat(avg_frame[np.newaxis], frames.shape[0], axis=0)
         
-        return jsonify({
-            'frames': enhanced_frames,
+        return json_response({
+            **frames_payload(enhanced_frames),
             'waveform': enhanced_frames[0],  # Return first frame for display
-            'spectrum': np.abs(np.fft.rfft(enhanced_frames[0])).tolist()
+            'spectrum': np.abs(np.fft.rfft(enhanced_frames[0]))
         })
         
+    except ValueError as e:
+        logger.error(f"Invalid enhance request: {str(e)}")
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Unexpected error in enhance_waveform: {str(e)}")
         logger.error(traceback.format_exc())
@@ -449,92 +651,75 @@ def apply_chaos_fold():
     if request.method == 'OPTIONS':
         return make_response('', 204)
         
+    logger.debug("Received chaos fold request")
+    
+    if not request.is_json:
+        logger.error("Request is not JSON")
+        return jsonify({'error': 'Request must be JSON'}), 400
+        
     try:
-        logger.debug("Received chaos fold request")
+        data = request.get_json(force=True)
+    except Exception as e:
+        logger.error(f"Failed to parse JSON: {str(e)}")
+        return jsonify({'error': 'Invalid JSON format'}), 400
         
-        if not request.is_json:
-            logger.error("Request is not JSON")
-            return jsonify({'error': 'Request must be JSON'}), 400
-            
-        try:
-            data = request.get_json(force=True)
-            logger.debug(f"Raw request data: {data}")
-        except Exception as e:
-            logger.error(f"Failed to parse JSON: {str(e)}")
-            return jsonify({'error': 'Invalid JSON format'}), 400
-            
-        if not data:
-            logger.error("Empty request data")
-            return jsonify({'error': 'No data provided'}), 400
-            
-        # Extract and validate frames
-        frames = data.get('frames')
-        if not frames:
-            logger.error("No frame data provided")
-            return jsonify({'error': 'No frame data provided'}), 400
-            
-        try:
-            validate_frames(frames)
-            frames = [[float(x) for x in frame] for frame in frames]
-        except ValueError as e:
-            logger.error(f"Frame validation error: {str(e)}")
-            return jsonify({'error': str(e)}), 400
-            
-        # Extract and validate parameters
-        try:
-            params = validate_params(data)
-        except ValueError as e:
-            logger.error(f"Parameter validation error: {str(e)}")
-            return jsonify({'error': str(e)}), 400
-            
-        logger.debug(f"Processing with parameters: {params}")
+    if not data:
+        logger.error("Empty request data")
+        return jsonify({'error': 'No data provided'}), 400
+        
+    # Extract and validate frames
+    try:
+        frames = request_frames(data)
+    except ValueError as e:
+        logger.error(f"Frame validation error: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+        
+    # Extract and validate parameters
+    try:
+        params = validate_params(data)
+    except ValueError as e:
+        logger.error(f"Parameter validation error: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+        
+    logger.debug("Processing with parameters: %s", params)
+    
+    # Fold all frames in one batch; they share a single Lorenz trajectory
+    if frames.shape[1] == 0:
+        logger.error("Empty frame data")
+        return jsonify({'error': 'Empty frame data'}), 400
+        
+    try:
+        folded = lorenz_wavefold(
+            frames,
+            sigma=params['sigma'],
+            rho=params['rho'],
+            beta=params['beta'],
+            dt=params['dt']
+        )
+        processed_frames = optimize_array(folded, precision=4).astype(np.float32)
+        
+        if wants_pcm():
+            return pcm_response(processed_frames)
+        
+        # Calculate spectrum for visualization
+        spectrum = optimize_array(np.abs(np.fft.rfft(processed_frames[0])), precision=4)
+        
+        # Prepare response
+        response = {
+            'waveform': processed_frames[0],
+            **frames_payload(processed_frames),
+            'frame_size': len(processed_frames[0]),
+            'num_frames': len(processed_frames),
+            'spectrum': spectrum
+        }
+        
+        logger.debug("Successfully processed chaos fold request")
+        return json_response(response)
         
-        # Process each frame with the chaos folder
-        processed_frames = []
-        try:
-            for frame in frames:
-                frame_array = np.array(frame, dtype=np.float64)
-                if frame_array.size == 0:
-                    logger.error("Empty frame data")
-                    return jsonify({'error': 'Empty frame data'}), 400
-                    
-                folded = lorenz_wavefold(
-                    frame_array,
-                    sigma=params['sigma'],
-                    rho=params['rho'],
-                    beta=params['beta'],
-                    dt=params['dt']
-                )
-                processed_frames.append(optimize_array(folded, precision=4).tolist())
-            
-            # Calculate spectrum for visualization
-            spectrum = optimize_array(np.abs(np.fft.rfft(processed_frames[0])), precision=4).tolist()
-            
-            # Prepare response
-            response = {
-                'waveform': processed_frames[0],
-                'frames': processed_frames,
-                'frame_size': len(processed_frames[0]),
-                'num_frames': len(processed_frames),
-                'spectrum': spectrum
-            }
-            
-            # Validate response data
-            if not all(isinstance(arr, list) for arr in [response['waveform'], response['frames'][0], response['spectrum']]):
-                raise ValueError("Invalid response data format")
-            
-            logger.debug("Successfully processed chaos fold request")
-            return jsonify(response)
-            
-        except Exception as e:
-            logger.error(f"Error processing frames: {str(e)}")
-            logger.error(traceback.format_exc())
-            return jsonify({'error': f'Error processing frames: {str(e)}'}), 500
-            
     except Exception as e:
-        logger.error(f"Unexpected error in apply_chaos_fold: {str(e)}")
+        logger.error(f"Error processing frames: {str(e)}")
         logger.error(traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': f'Error processing frames: {str(e)}'}), 500
 
 @app.route('/api/waveform/image', methods=['POST'])
 def image_to_wavetable():
@@ -562,36 +747,35 @@ def image_to_wavetable():
                 return jsonify({'error': 'Failed to decode image'}), 400
                 
             # Log the original image shape
-            logger.info(f"Original image shape: {img.shape}")
+            logger.debug("Original image shape: %s", img.shape)
                 
-            # Resize to 2048x256 (OKWT's dimensions)
-            img = cv2.resize(img, (2048, 256), interpolation=cv2.INTER_LINEAR)
+            # Resize to 2048x256 (OKWT's dimensions); area averaging avoids
+            # aliasing when shrinking, linear interpolation is used to enlarge
+            if img.shape[0] > 256 or img.shape[1] > 2048:
+                interpolation = cv2.INTER_AREA
+            else:
+                interpolation = cv2.INTER_LINEAR
+            img = cv2.resize(img, (2048, 256), interpolation=interpolation)
             
             # Log the resized image shape
-            logger.info(f"Resized image shape: {img.shape}")
-            
-            # Convert to float and normalize to [-1, 1]
-            frames = []
+            logger.debug("Resized image shape: %s", img.shape)
             
-            # Process each row as a frame
-            for row in img:
-                # Convert to float32 for better precision
-                frame = row.astype(np.float32)
-                # Normalize to [-1, 1] range
-                frame = (frame / 127.5) - 1.0
-                frames.append(frame.tolist())
+            # Each row becomes a frame: convert to float32 and normalize the
+            # whole image to [-1, 1] at once
+            frames = img.astype(np.float32)
+            frames /= 127.5
+            frames -= 1.0
             
             # Log the number of frames and frame size
-            logger.info(f"Number of frames: {len(frames)}")
-            logger.info(f"Frame size: {len(frames[0]) if frames else 0}")
+            logger.debug("Number of frames: %d", frames.shape[0])
+            logger.debug("Frame size: %d", frames.shape[1])
             
             # Calculate spectrum for visualization
-            spectrum = np.abs(np.fft.fft(frames[0]))
-            spectrum = spectrum[:len(spectrum)//2].tolist()
+            spectrum = np.abs(np.fft.rfft(frames[0]))
             
-            return jsonify({
+            return json_response({
                 'waveform': frames[0],
-                'frames': frames,
+                **frames_payload(frames),
                 'spectrum': spectrum,
                 'frame_size': len(frames[0]),
                 'num_frames': len(frames),
@@ -609,4 +793,4 @@ def image_to_wavetable():
         return jsonify({'error': str(e)}), 400
 
 if __name__ == '__main__':
-    app.run(debug=True, port=8081, host='0.0.0.0')
+    app.run(debug=DEBUG, port=8081, host='0.0.0.0')
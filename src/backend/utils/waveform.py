@@ -5,19 +5,25 @@ def normalize_waveform(samples: np.ndarray) -> np.ndarray:
     """Normalize waveform to range [-1, 1]."""
     if len(samples) == 0:
         return samples
-    max_abs = np.max(np.abs(samples))
+    if np.asarray(samples).dtype.kind == 'f':
+        max_abs = max(np.max(samples), -np.min(samples))
+    else:
+        # Negating unsigned or minimum-valued integers wraps around
+        max_abs = np.max(np.abs(samples))
     if max_abs > 0:
         return samples / max_abs
     return samples
 
 def interpolate_frames(frame1: np.ndarray, frame2: np.ndarray, num_steps: int) -> List[np.ndarray]:
     """Linear interpolation between two wavetable frames."""
-    frames = []
-    for i in range(num_steps):
-        t = i / (num_steps - 1)
-        frame = (1 - t) * frame1 + t * frame2
-        frames.append(frame)
-    return frames
+    frame1 = np.asarray(frame1)
+    frame2 = np.asarray(frame2)
+    
+    # Blend every step at once: one interpolation factor per row, broadcast
+    # across the samples, and return the rows of the result
+    dtype = np.result_type(frame1.dtype, frame2.dtype, np.float32)
+    t = np.linspace(0.0, 1.0, num_steps, dtype=dtype)[:, np.newaxis]
+    return list((1 - t) * frame1 + t * frame2)
 
 def validate_wavetable(frames: List[np.ndarray]) -> Tuple[bool, str]:
     """Validate wavetable frames for consistency and proper format."""
@@ -28,7 +34,10 @@ def validate_wavetable(frames: List[np.ndarray]) -> Tuple[bool, str]:
     for i, frame in enumerate(frames):
         if len(frame) != expected_length:
             return False, f"Frame {i} has inconsistent length"
-        if not np.all(np.isfinite(frame)):
-            return False, f"Frame {i} contains invalid values"
+    
+    # Frames all have the same length, so check every value in one reduction
+    finite = np.isfinite(np.asarray(frames)).all(axis=-1)
+    if not finite.all():
+        return False, f"Frame {int(np.argmin(finite))} contains invalid values"
     
     return True, "Valid wavetable"
@@ -0,0 +1,8 @@
+"""WSGI entry point for serving the backend with a multi-worker server.
+
+Run from src/backend, e.g.:
+    gunicorn -w 4 -k gthread --threads 4 -b 0.0.0.0:8081 wsgi:app
+"""
+from app import app
+
+__all__ = ['app']